@@ -0,0 +1,70 @@
+"""
+Socket API load benchmark
+Pushes batched messages through an in-process MeshtasticServer and reports throughput
+
+    python benchmarks/server_load.py --messages 50000 --overflow block
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from meshtastic_sim import MeshtasticEngine
+from meshtastic_server import MeshtasticServer
+
+
+async def run_load(num_nodes, num_messages, batch_size, overflow, max_pending, max_in_flight):
+    """Send num_messages over one connection while reading events; return counts and rate"""
+    random.seed(0)
+    engine = MeshtasticEngine(history_limit=1000)
+    engine.create_network(num_nodes)
+    server = MeshtasticServer(engine, port=0, speed=0, overflow=overflow,
+                              max_pending=max_pending, max_in_flight=max_in_flight)
+    await server.start()
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+
+    async def produce():
+        for start in range(0, num_messages, batch_size):
+            batch = [{"from": i % num_nodes, "to": (i * 7 + 1) % num_nodes, "tag": i}
+                     for i in range(start, min(start + batch_size, num_messages))]
+            writer.write(json.dumps({"op": "send", "messages": batch}).encode() + b"\n")
+            await writer.drain()
+
+    started = time.perf_counter()
+    producer = asyncio.create_task(produce())
+    counts = {}
+    finished = 0
+    while finished < num_messages:
+        event = json.loads(await reader.readline())
+        counts[event["type"]] = counts.get(event["type"], 0) + 1
+        if event["type"] in ("delivered", "failed", "rejected"):
+            finished += 1
+    elapsed = time.perf_counter() - started
+    await producer
+    writer.close()
+    await server.close()
+    return counts, num_messages / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Meshtastic socket API load benchmark")
+    parser.add_argument("--nodes", type=int, default=30)
+    parser.add_argument("--messages", type=int, default=50000)
+    parser.add_argument("--batch", type=int, default=500)
+    parser.add_argument("--overflow", choices=("block", "reject"), default="block")
+    parser.add_argument("--max-pending", type=int, default=10000)
+    parser.add_argument("--max-in-flight", type=int, default=5000)
+    args = parser.parse_args()
+
+    counts, rate = asyncio.run(run_load(args.nodes, args.messages, args.batch, args.overflow,
+                                        args.max_pending, args.max_in_flight))
+    print(f"{args.messages} messages, {args.nodes} nodes, overflow={args.overflow}: {rate:.0f} msg/s")
+    print("  " + "  ".join(f"{kind}={count}" for kind, count in sorted(counts.items())))
+
+if __name__ == "__main__":
+    main()
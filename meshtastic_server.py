@@ -0,0 +1,397 @@
+"""
+Meshtastic Simulator Socket API
+Asyncio TCP server for injecting messages from external harnesses with bounded queues
+
+Protocol: newline-delimited JSON over a localhost TCP connection.
+
+Requests (client -> server):
+    {"op": "send", "messages": [{"from": 0, "to": 5, "text": "hi", "tag": "abc"}, ...]}
+    {"op": "stats"}
+
+Events (server -> client):
+    {"type": "ack", "accepted": 2, "rejected": 0}
+    {"type": "rejected", "tag": "abc", "reason": "queue full"}
+    {"type": "delivered", "id": 7, "tag": "abc", "from": 0, "to": 5, "hops": 2,
+     "latency": 0.2, "sim_time": 12.3}
+    {"type": "failed", "id": 8, "tag": "abd", "from": 0, "to": 9, "reason": "no route",
+     "sim_time": 12.3}
+    {"type": "stats", ...}
+    {"type": "error", "reason": "..."}
+
+Node ids are the simulator's 0-based ids ("Node 1" in the GUI is id 0).
+
+Backpressure:
+    * Accepted requests wait in one bounded inbound queue (max_pending). With the
+      "block" overflow policy the connection stops being read while the queue is
+      full, so TCP flow control pushes back on the sender. With "reject" every
+      message that does not fit is answered with a "rejected" event.
+    * At most max_in_flight messages are admitted into the engine at once.
+    * Each connection has a bounded event queue (max_client_events). A client that
+      stops reading until its queue is full is sent an "event queue full" error
+      and disconnected, so one slow client never stalls the others.
+
+A client may half-close its socket (shutdown(SHUT_WR)) after sending: the server
+stops reading, keeps streaming until all of that client's messages finished and
+its events were written, then closes the connection.
+"""
+import asyncio
+import json
+
+from meshtastic_sim import MeshtasticEngine
+
+
+class ClientConnection:
+    def __init__(self, reader, writer, max_events):
+        self.reader = reader
+        self.writer = writer
+        self.events = asyncio.Queue(maxsize=max_events)
+        self.writer_task = None
+        self.closed = False
+        # Accepted messages that have not been delivered or failed yet
+        self.outstanding = 0
+        self.idle = asyncio.Event()
+        self.idle.set()
+
+    def track(self):
+        """Count one more accepted message for this client"""
+        self.outstanding += 1
+        self.idle.clear()
+
+    def untrack(self):
+        """Count one accepted message as finished"""
+        self.outstanding -= 1
+        if self.outstanding == 0:
+            self.idle.set()
+
+    async def flush(self):
+        """Wait until every accepted message finished and all events were written"""
+        await self.idle.wait()
+        await self.events.join()
+
+    def close(self):
+        """Mark the connection closed and release anyone waiting on it"""
+        self.closed = True
+        self.idle.set()
+        if self.writer_task:
+            # Its pending batch is marked done, so flush() cannot hang on a dead socket
+            self.writer_task.cancel()
+        self.discard_events()
+
+    def discard_events(self):
+        """Drop queued events, marking them done so events.join() can finish"""
+        while not self.events.empty():
+            self.events.get_nowait()
+            self.events.task_done()
+
+
+class MeshtasticServer:
+    def __init__(self, engine, host="127.0.0.1", port=4403, speed=10.0,
+                 max_pending=10000, max_in_flight=5000, max_client_events=10000,
+                 overflow="block", max_line_bytes=1 << 20, close_timeout=5.0):
+        if overflow not in ("block", "reject"):
+            raise ValueError(f"Unknown overflow policy: {overflow}")
+        self.engine = engine
+        self.host = host
+        self.port = port
+        self.speed = speed  # Simulation speed-up over real time; 0 runs as fast as possible
+        self.max_in_flight = max_in_flight
+        self.max_client_events = max_client_events
+        self.overflow = overflow
+        self.max_line_bytes = max_line_bytes
+        # Seconds to let a closing connection flush before aborting it (peer not reading)
+        self.close_timeout = close_timeout
+
+        # Bounded inbound queue of (client, from_id, to_id, text, tag) tuples
+        self.inbound = asyncio.Queue(maxsize=max_pending)
+        # Engine message id -> (client, tag) for messages that have not finished yet
+        self.owners = {}
+        self.step_events = []
+        self.engine.event_listeners.append(self.on_engine_event)
+
+        self.server = None
+        self.sim_task = None
+        self.client_tasks = {}  # ClientConnection -> handle_client task
+        self.closing = False
+        self.delivered_count = 0
+        self.failed_count = 0
+        self.rejected_count = 0
+        self.dropped_count = 0
+
+    async def start(self):
+        """Start listening and run the simulation loop in the background"""
+        self.server = await asyncio.start_server(self.handle_client, self.host, self.port,
+                                                 limit=self.max_line_bytes)
+        # Report the actual port when an ephemeral one (0) was requested
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.sim_task = asyncio.create_task(self.simulation_loop())
+
+    async def close(self):
+        """Stop accepting clients, disconnect open clients and stop the simulation loop"""
+        self.closing = True
+        if self.server:
+            self.server.close()
+        tasks = list(self.client_tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self.sim_task:
+            self.sim_task.cancel()
+            try:
+                await self.sim_task
+            except asyncio.CancelledError:
+                pass
+            self.sim_task = None
+        if self.server:
+            await self.server.wait_closed()
+            self.server = None
+
+    async def handle_client(self, reader, writer):
+        """Serve one client: read requests, then flush its results before closing"""
+        client = ClientConnection(reader, writer, self.max_client_events)
+        self.client_tasks[client] = asyncio.current_task()
+        writer_task = client.writer_task = asyncio.create_task(self.write_events(client))
+        try:
+            await self.read_requests(client)
+            if not client.closed:
+                # EOF or an unrecoverable request: finish this client's messages first
+                await client.flush()
+        except (ConnectionError, asyncio.CancelledError):
+            # Connection lost or server shutting down; nothing left to deliver
+            pass
+        finally:
+            client.close()
+            writer_task.cancel()
+            await asyncio.gather(writer_task, return_exceptions=True)
+            try:
+                await asyncio.wait_for(self.linger(reader, writer), self.close_timeout)
+            except asyncio.TimeoutError:
+                # Peer stopped reading; discard what is still buffered for it
+                writer.transport.abort()
+            except ConnectionError:
+                pass
+            self.client_tasks.pop(client, None)
+
+    async def linger(self, reader, writer):
+        """Close gracefully: send EOF after buffered output, consume the peer's input, then close
+
+        Closing with unread input would reset the connection and lose the last events.
+        """
+        if writer.can_write_eof() and not writer.is_closing():
+            writer.write_eof()
+        # On server shutdown don't wait for peers to finish sending
+        while not self.closing and await reader.read(1 << 16):
+            pass
+        writer.close()
+        await writer.wait_closed()
+
+    async def read_requests(self, client):
+        """Handle request lines until EOF, an oversized line or disconnection"""
+        while not client.closed:
+            try:
+                line = await client.reader.readline()
+            except ValueError:
+                # Line longer than max_line_bytes; the stream cannot be resynchronised
+                await self.send_event(client, {"type": "error", "reason": "request too large"})
+                return
+            if not line:
+                return
+            await self.handle_request(client, line)
+
+    async def handle_request(self, client, line):
+        """Parse and dispatch a single JSON request line"""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            await self.send_event(client, {"type": "error", "reason": "invalid JSON"})
+            return
+        if not isinstance(request, dict):
+            await self.send_event(client, {"type": "error", "reason": "request must be an object"})
+            return
+
+        op = request.get("op")
+        if op == "send":
+            batch = request.get("messages", [])
+            if not isinstance(batch, list):
+                await self.send_event(client, {"type": "error", "reason": "messages must be a list"})
+                return
+            await self.enqueue_batch(client, batch)
+        elif op == "stats":
+            await self.send_event(client, self.stats())
+        else:
+            await self.send_event(client, {"type": "error", "reason": f"unknown op: {op}"})
+
+    async def enqueue_batch(self, client, batch):
+        """Validate a batch and move it into the bounded inbound queue"""
+        accepted = 0
+        rejected = 0
+        for item in batch:
+            tag = item.get("tag") if isinstance(item, dict) else None
+            reason = self.validate(item)
+            if reason is None:
+                entry = (client, item["from"], item["to"], str(item.get("text", "")), tag)
+                client.track()
+                if self.overflow == "block":
+                    await self.inbound.put(entry)
+                    accepted += 1
+                    continue
+                try:
+                    self.inbound.put_nowait(entry)
+                    accepted += 1
+                    continue
+                except asyncio.QueueFull:
+                    client.untrack()
+                    reason = "queue full"
+            rejected += 1
+            self.rejected_count += 1
+            await self.send_event(client, {"type": "rejected", "tag": tag, "reason": reason})
+        await self.send_event(client, {"type": "ack", "accepted": accepted, "rejected": rejected})
+
+    def validate(self, item):
+        """Return None for a valid send entry, otherwise the rejection reason"""
+        if not isinstance(item, dict):
+            return "message must be an object"
+        from_id = item.get("from")
+        to_id = item.get("to")
+        # bool is an int subclass; JSON true/false are not node ids
+        if any(not isinstance(node_id, int) or isinstance(node_id, bool) for node_id in (from_id, to_id)):
+            return "node ids must be integers"
+        if from_id not in self.engine.nodes or to_id not in self.engine.nodes:
+            return "unknown node"
+        if from_id == to_id:
+            return "cannot send message to same node"
+        return None
+
+    async def send_event(self, client, event):
+        """Queue a reply for a client, pausing its request reader while its event queue is full"""
+        if not client.closed:
+            await client.events.put(event)
+            if client.closed:
+                # Closed while waiting for space; nobody will write this event
+                client.discard_events()
+
+    def push_event(self, client, event):
+        """Queue a simulation event without waiting; disconnect the client if it fell behind"""
+        if client.closed:
+            return
+        try:
+            client.events.put_nowait(event)
+        except asyncio.QueueFull:
+            self.drop_client(client, "event queue full")
+
+    def drop_client(self, client, reason):
+        """Disconnect a client that stopped reading, telling it why"""
+        self.dropped_count += 1
+        client.close()
+        client.writer.write(json.dumps({"type": "error", "reason": reason}).encode() + b"\n")
+        # The handler may be waiting on a request that never comes; its cleanup closes the socket
+        task = self.client_tasks.get(client)
+        if task:
+            task.cancel()
+
+    async def write_events(self, client):
+        """Drain a client's event queue onto its socket"""
+        try:
+            while True:
+                batch = [await client.events.get()]
+                # Batch whatever is already queued before waiting on the socket
+                while not client.events.empty():
+                    batch.append(client.events.get_nowait())
+                try:
+                    for event in batch:
+                        client.writer.write(json.dumps(event).encode() + b"\n")
+                    await client.writer.drain()
+                finally:
+                    for _ in batch:
+                        client.events.task_done()
+        except ConnectionError:
+            client.close()
+
+    def on_engine_event(self, event_type, message):
+        """Collect engine events during a step; dispatched once the step is done"""
+        self.step_events.append((event_type, message))
+
+    def admit(self, entry):
+        """Hand one queued request to the engine"""
+        client, from_id, to_id, text, tag = entry
+        if client.closed:
+            client.untrack()
+            return
+        msg = self.engine.queue_message(from_id, to_id, text)
+        self.owners[msg.id] = (client, tag)
+
+    def admit_messages(self):
+        """Move queued requests into the engine up to the in-flight limit"""
+        while len(self.engine.message_queue) < self.max_in_flight and not self.inbound.empty():
+            self.admit(self.inbound.get_nowait())
+
+    async def simulation_loop(self):
+        """Advance the engine, admitting new messages and streaming final states"""
+        while True:
+            if self.speed <= 0 and not self.engine.message_queue and self.inbound.empty():
+                # Nothing to simulate; wait for work instead of spinning
+                self.admit(await self.inbound.get())
+
+            self.admit_messages()
+            self.engine.step()
+            self.dispatch_events()
+
+            await asyncio.sleep(self.engine.time_step / self.speed if self.speed > 0 else 0)
+
+    def dispatch_events(self):
+        """Send the events collected during the last step to their clients"""
+        events, self.step_events = self.step_events, []
+        for event_type, msg in events:
+            client, tag = self.owners.pop(msg.id, (None, None))
+            if event_type == "delivered":
+                self.delivered_count += 1
+                event = {"type": "delivered", "id": msg.id, "tag": tag,
+                         "from": msg.from_node, "to": msg.to_node,
+                         "hops": len(msg.path) - 1,
+                         "latency": round(self.engine.simulation_time - msg.created_at_sim_time, 6),
+                         "sim_time": round(self.engine.simulation_time, 6)}
+            else:
+                self.failed_count += 1
+                event = {"type": "failed", "id": msg.id, "tag": tag,
+                         "from": msg.from_node, "to": msg.to_node, "reason": "no route",
+                         "sim_time": round(self.engine.simulation_time, 6)}
+            if client is not None:
+                client.untrack()
+                self.push_event(client, event)
+
+    def stats(self):
+        """Snapshot of queue depths and delivery counters"""
+        return {"type": "stats",
+                "sim_time": round(self.engine.simulation_time, 6),
+                "nodes": len(self.engine.nodes),
+                "pending": self.inbound.qsize(),
+                "max_pending": self.inbound.maxsize,
+                "in_flight": len(self.engine.message_queue),
+                "max_in_flight": self.max_in_flight,
+                "delivered": self.delivered_count,
+                "failed": self.failed_count,
+                "rejected": self.rejected_count,
+                "dropped_clients": self.dropped_count}
+
+
+async def run_server(num_nodes=10, **kwargs):
+    """Create a headless network of num_nodes nodes and serve it until cancelled"""
+    engine = MeshtasticEngine(history_limit=1000)
+    engine.create_network(num_nodes)
+    server = MeshtasticServer(engine, **kwargs)
+    await server.start()
+    print(f"Meshtastic simulator API listening on {server.host}:{server.port} "
+          f"({num_nodes} nodes, overflow={server.overflow})")
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+def main():
+    """Command line entry point for the socket API (same options as `meshtastic_sim.py serve`)"""
+    import sys
+    from meshtastic_sim import main as sim_main
+    sim_main(["serve", *sys.argv[1:]])
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+import meshtastic_sim
+from meshtastic_sim import main, run_simulation, run_sweep
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def run_json(capsys, argv):
+    main(argv)
+    return json.loads(capsys.readouterr().out)
+
+
+def test_run_json_is_stable_for_a_seed(capsys):
+    first = run_json(capsys, ["run", "--seed", "1", "--json"])
+    second = run_json(capsys, ["run", "--seed", "1", "--json"])
+    assert first == second
+    assert first["nodes"] == 10 and first["messages"] == 100
+    assert first["delivered"] + first["failed"] == 100
+    assert first["in_flight"] == 0
+    assert first["delivery_rate"] == pytest.approx(first["delivered"])
+    assert first["avg_delivery_time"] > 0
+
+
+def test_run_duration_stops_early():
+    stats = run_simulation(num_nodes=20, num_messages=50, duration=0.1, seed=3)
+    assert stats["sim_time"] == pytest.approx(0.1)
+    assert stats["in_flight"] > 0
+
+
+def test_sweep_averages_trials(capsys):
+    rows = run_json(capsys, ["sweep", "--nodes", "5", "20", "--trials", "3",
+                             "--messages", "40", "--seed", "7", "--json"])
+    assert [row["nodes"] for row in rows] == [5, 20]
+    for row, num_nodes in zip(rows, (5, 20)):
+        trials = [run_simulation(num_nodes, 40, seed=7 + trial) for trial in range(3)]
+        assert row["trials"] == 3
+        for key in ("delivered", "failed", "avg_hops", "avg_delivery_time", "connectivity"):
+            assert row[key] == pytest.approx(sum(t[key] for t in trials) / 3)
+
+
+@pytest.mark.parametrize("argv", [
+    ["sweep", "--trials", "0"],
+    ["sweep", "--nodes", "10", "-1"],
+    ["run", "--nodes", "0"],
+    ["run", "--messages", "-5"],
+])
+def test_invalid_counts_are_rejected(argv, capsys):
+    with pytest.raises(SystemExit) as excinfo:
+        main(argv)
+    assert excinfo.value.code == 2
+    assert "must be at least" in capsys.readouterr().err
+
+
+def test_run_sweep_rejects_zero_trials():
+    with pytest.raises(ValueError):
+        run_sweep([10], trials=0)
+
+
+def test_import_does_not_load_gui_modules():
+    code = ("import sys, meshtastic_sim; "
+            "loaded = [m for m in ('tkinter', 'matplotlib', 'networkx') if m in sys.modules]; "
+            "print(','.join(loaded))")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == ""
+
+
+def test_headless_run_does_not_load_gui_modules():
+    code = ("import sys, meshtastic_sim; meshtastic_sim.main(['run', '--messages', '5']); "
+            "print([m for m in ('tkinter', 'matplotlib') if m in sys.modules])")
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT,
+                            capture_output=True, text=True, check=True)
+    assert result.stdout.strip().splitlines()[-1] == "[]"
+
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        meshtastic_sim.does_not_exist
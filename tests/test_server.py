@@ -0,0 +1,240 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+from meshtastic_sim import MeshtasticEngine, MeshtasticNode
+from meshtastic_server import MeshtasticServer
+
+
+def make_engine():
+    """Nodes 0-2 form a chain within range; node 3 is unreachable"""
+    engine = MeshtasticEngine(history_limit=100)
+    for node_id, x, y in [(0, 0, 0), (1, 100, 0), (2, 200, 0), (3, 1000, 1000)]:
+        engine.nodes[node_id] = MeshtasticNode(node_id, x, y)
+    engine.max_range = 120
+    return engine
+
+
+def run(coro):
+    return asyncio.run(asyncio.wait_for(coro, timeout=20))
+
+
+async def start_server(**kwargs):
+    server = MeshtasticServer(make_engine(), port=0, speed=0, **kwargs)
+    await server.start()
+    reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+    return server, reader, writer
+
+
+async def send(writer, request):
+    writer.write(json.dumps(request).encode() + b"\n")
+    await writer.drain()
+
+
+async def read_until(reader, done):
+    """Read events until done(events) is true"""
+    events = []
+    while not done(events):
+        line = await reader.readline()
+        assert line, f"connection closed early after {events}"
+        events.append(json.loads(line))
+    return events
+
+
+def finished(events):
+    return [e for e in events if e["type"] in ("delivered", "failed", "rejected")]
+
+
+def test_send_acks_and_reports_each_message():
+    async def scenario():
+        server, reader, writer = await start_server()
+        batch = [{"from": 0, "to": 2, "text": "hi", "tag": "a"},
+                 {"from": 1, "to": 0, "text": "hi", "tag": "b"},
+                 {"from": 0, "to": 3, "text": "hi", "tag": "c"}]
+        await send(writer, {"op": "send", "messages": batch})
+        events = await read_until(reader, lambda ev: len(finished(ev)) == 3)
+        writer.close()
+        await server.close()
+        return events
+
+    events = run(scenario())
+    assert events[0] == {"type": "ack", "accepted": 3, "rejected": 0}
+    by_tag = {e["tag"]: e for e in finished(events)}
+    assert by_tag["a"]["type"] == "delivered" and by_tag["a"]["hops"] == 2
+    assert by_tag["b"]["type"] == "delivered" and by_tag["b"]["hops"] == 1
+    assert by_tag["c"]["type"] == "failed" and by_tag["c"]["reason"] == "no route"
+    assert by_tag["a"]["latency"] > 0
+
+
+def test_reject_overflow_when_inbound_is_full():
+    async def scenario():
+        server, reader, writer = await start_server(max_pending=5, overflow="reject")
+        batch = [{"from": 0, "to": 1, "tag": i} for i in range(20)]
+        await send(writer, {"op": "send", "messages": batch})
+        events = await read_until(reader, lambda ev: len(finished(ev)) == 20)
+        writer.close()
+        await server.close()
+        return events
+
+    events = run(scenario())
+    ack = next(e for e in events if e["type"] == "ack")
+    rejected = [e for e in events if e["type"] == "rejected"]
+    assert ack["accepted"] == 5 and ack["rejected"] == 15
+    assert len(rejected) == 15 and all(e["reason"] == "queue full" for e in rejected)
+    assert sorted(e["tag"] for e in finished(events)) == list(range(20))
+
+
+def test_block_overflow_keeps_queues_bounded():
+    async def scenario():
+        server, reader, writer = await start_server(max_pending=10, max_in_flight=20)
+        peaks = {"pending": 0, "in_flight": 0}
+
+        async def sample():
+            while True:
+                peaks["pending"] = max(peaks["pending"], server.inbound.qsize())
+                peaks["in_flight"] = max(peaks["in_flight"], len(server.engine.message_queue))
+                await asyncio.sleep(0)
+
+        sampler = asyncio.create_task(sample())
+        for start in range(0, 2000, 200):
+            batch = [{"from": 0, "to": 2, "tag": i} for i in range(start, start + 200)]
+            await send(writer, {"op": "send", "messages": batch})
+        events = await read_until(reader, lambda ev: len(finished(ev)) == 2000)
+        sampler.cancel()
+        writer.close()
+        await server.close()
+        return events, peaks
+
+    events, peaks = run(scenario())
+    assert {e["type"] for e in finished(events)} == {"delivered"}
+    assert sum(e["accepted"] for e in events if e["type"] == "ack") == 2000
+    assert 0 < peaks["pending"] <= 10
+    assert peaks["in_flight"] <= 20
+
+
+def test_half_close_still_streams_results():
+    async def scenario():
+        server, reader, writer = await start_server()
+        batch = [{"from": 0, "to": 2, "tag": i} for i in range(50)]
+        await send(writer, {"op": "send", "messages": batch})
+        writer.write_eof()
+        data = await reader.read()
+        await server.close()
+        return [json.loads(line) for line in data.splitlines()], server
+
+    events, server = run(scenario())
+    assert sorted(e["tag"] for e in events if e["type"] == "delivered") == list(range(50))
+    assert server.owners == {}
+
+
+def test_malformed_requests_get_errors():
+    async def scenario():
+        server, reader, writer = await start_server()
+        await send(writer, {"op": "send", "messages": 5})
+        await send(writer, {"op": "send", "messages": {"from": 0, "to": 1}})
+        await send(writer, [1, 2])
+        await send(writer, {"op": "bogus"})
+        writer.write(b"not json\n")
+        await send(writer, {"op": "send", "messages": [{"from": True, "to": False, "tag": "t"},
+                                                       {"from": 0, "to": 9, "tag": "u"},
+                                                       {"from": 1, "to": 1, "tag": "v"},
+                                                       "x"]})
+        events = await read_until(reader, lambda ev: any(e["type"] == "ack" for e in ev))
+        writer.close()
+        await server.close()
+        return events
+
+    events = run(scenario())
+    errors = [e["reason"] for e in events if e["type"] == "error"]
+    assert errors == ["messages must be a list", "messages must be a list",
+                      "request must be an object", "unknown op: bogus", "invalid JSON"]
+    reasons = {e["tag"]: e["reason"] for e in events if e["type"] == "rejected"}
+    assert reasons == {"t": "node ids must be integers", "u": "unknown node",
+                       "v": "cannot send message to same node", None: "message must be an object"}
+    assert events[-1] == {"type": "ack", "accepted": 0, "rejected": 4}
+
+
+def test_oversized_request_reports_error_before_closing():
+    async def scenario():
+        server, reader, writer = await start_server(max_line_bytes=1000)
+        writer.write(b"x" * 5000 + b"\n")
+        await writer.drain()
+        data = await reader.read()
+        await server.close()
+        return data
+
+    assert json.loads(run(scenario())) == {"type": "error", "reason": "request too large"}
+
+
+def test_close_stops_open_clients():
+    async def scenario():
+        server, reader, writer = await start_server()
+        await send(writer, {"op": "stats"})
+        stats = json.loads(await reader.readline())
+        await server.close()
+        return stats, await reader.read(), server
+
+    stats, rest, server = run(scenario())
+    assert stats["type"] == "stats" and stats["nodes"] == 4
+    assert rest == b""
+    assert server.client_tasks == {}
+
+
+async def wait_for_condition(condition):
+    while not condition():
+        await asyncio.sleep(0.01)
+
+
+@pytest.mark.parametrize("reads_after_drop", [True, False])
+def test_slow_client_is_dropped_without_stalling_others(reads_after_drop):
+    async def scenario():
+        server = MeshtasticServer(make_engine(), port=0, speed=0, max_client_events=5,
+                                  close_timeout=0.5)
+        await server.start()
+        # Small socket buffers so an unread connection backs up quickly
+        server.server.sockets[0].setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, 4096)
+        sock = socket.socket()
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+        sock.setblocking(False)
+        await asyncio.get_running_loop().sock_connect(sock, ("127.0.0.1", server.port))
+        slow_reader, slow_writer = await asyncio.open_connection(sock=sock)
+        reader, writer = await asyncio.open_connection("127.0.0.1", server.port)
+        await wait_for_condition(lambda: len(server.client_tasks) == 2)
+
+        async def flood():
+            try:
+                while True:
+                    batch = [{"from": 0, "to": 2, "tag": i} for i in range(200)]
+                    await send(slow_writer, {"op": "send", "messages": batch})
+                    await send(slow_writer, {"op": "stats"})
+            except ConnectionError:
+                pass
+
+        flooder = asyncio.create_task(flood())
+        await wait_for_condition(lambda: server.dropped_count == 1)
+        flooder.cancel()
+
+        # The other client is still served after the drop
+        await send(writer, {"op": "send", "messages": [{"from": 0, "to": 2, "tag": "fast"}]})
+        events = await read_until(reader, lambda ev: len(finished(ev)) == 1)
+
+        last_line = None
+        if reads_after_drop:
+            data = await slow_reader.read()
+            last_line = json.loads(data.splitlines()[-1])
+        await wait_for_condition(lambda: len(server.client_tasks) == 1)
+        remaining = [(c.writer.get_extra_info("peername"), c.closed) for c in server.client_tasks]
+        fast_address = writer.get_extra_info("sockname")
+
+        slow_writer.close()
+        writer.close()
+        await server.close()
+        return events, last_line, remaining, fast_address
+
+    events, last_line, remaining, fast_address = run(scenario())
+    assert finished(events) == [e for e in events if e["type"] == "delivered" and e["tag"] == "fast"]
+    if reads_after_drop:
+        assert last_line == {"type": "error", "reason": "event queue full"}
+    assert remaining == [(fast_address, False)]